@@ -8,21 +8,74 @@ Generates the three required files for Microsoft Power Platform connector certif
 3. README.md - Documentation with prerequisites, setup, and operations
 
 Usage:
-    python certification_packager.py <swagger_yaml_path> <config_yaml_path> <output_dir>
+    python certification_packager.py [--compact] <swagger_yaml_path> <config_yaml_path> <output_dir>
 """
 
 import sys
 import os
 import json
 import yaml
+from pathlib import Path
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# JSON encoder and orjson options, built once and reused for every output file
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+_COMPACT_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+_COMPACT_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+# Output buffer size; large enough that a full spec is flushed in one syscall
+_IO_BUFSIZE = 1 << 20
+
+# Fields validate_config requires in connector-config.yaml
+_REQUIRED_FIELDS = (
+    'publisher',
+    'displayName',
+    'iconBrandColor',
+    'supportEmail',
+    'prerequisites',
+    'knownLimitations',
+    'version'
+)
+_CONNECTION_PARAMETER_FIELDS = ('type', 'uiDefinition')
+_POLICY_TEMPLATE_FIELDS = ('templateId', 'parameters')
+
+# HTTP methods that extract_operations lists in the README
+_HTTP_METHODS = frozenset(('get', 'post', 'put', 'patch', 'delete'))
+
+# README blocks documenting the hostUrl connection parameter
+_CUSTOM_HOST_URLS_SECTIONS = (
+    "### Custom Host URLs",
+    "By default, the connector uses the production Fulcrum API at `api.fulcrumapp.com`. "
+    "For other regions, you can specify a different host URL "
+    "when creating your connection.",
+    "**Regional Endpoints:**\n"
+    "- United States (default): `api.fulcrumapp.com`\n"
+    "- Canada: `api.fulcrumapp-ca.com`\n"
+    "- Australia: `api.fulcrumapp-au.com`\n"
+    "- Europe: `api.fulcrumapp-eu.com`",
+    "**Format:** Enter only the hostname without protocol or path. The connector will "
+    "automatically use HTTPS and the correct API path.",
+    "**Troubleshooting:**\n"
+    "- Ensure your custom host is accessible from your network\n"
+    "- Verify the hostname is correct (no typos)\n"
+    "- Confirm your API token is valid for the specified host",
+)
+
 
 def load_yaml_file(file_path: str) -> Dict[str, Any]:
     """Load and parse a YAML file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        # Hand libyaml the raw bytes; it decodes UTF-8 itself
+        return yaml.load(Path(file_path).read_bytes(), Loader=_YAML_LOADER)
     except FileNotFoundError:
         print(f"ERROR: File not found: {file_path}", file=sys.stderr)
         sys.exit(1)
@@ -31,19 +84,70 @@ def load_yaml_file(file_path: str) -> Dict[str, Any]:
         sys.exit(1)
 
 
+def load_swagger_file(file_path: str) -> Dict[str, Any]:
+    """
+    Load the Swagger specification, parsing .json inputs as JSON.
+    
+    JSON is valid YAML, but a JSON parser reads it far faster than a YAML
+    loader, so only non-JSON inputs go through load_yaml_file.
+    """
+    if os.path.splitext(file_path)[1].lower() != '.json':
+        return load_yaml_file(file_path)
+    
+    try:
+        data = Path(file_path).read_bytes()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    except FileNotFoundError:
+        print(f"ERROR: File not found: {file_path}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"ERROR: Invalid JSON in {file_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def write_output_file(output_path: str, content: bytes) -> None:
+    """
+    Write content to output_path atomically.
+    
+    The data is written and fsynced to a sibling temporary file, which then
+    replaces output_path, so a crash never leaves a truncated output behind.
+    """
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=_IO_BUFSIZE) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def fsync_directory(dir_path: str) -> None:
+    """Flush directory entries (e.g. renames from write_output_file) to disk."""
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json_file(data: Dict[str, Any], output_path: str, compact: bool = False) -> None:
+    """Serialize data as JSON (indented unless compact), using orjson when it is installed."""
+    if orjson is not None:
+        content = orjson.dumps(data, option=_COMPACT_ORJSON_OPTIONS if compact else _ORJSON_OPTIONS)
+    else:
+        # Encode once and write once instead of json.dump's chunked writes
+        encoder = _COMPACT_JSON_ENCODER if compact else _JSON_ENCODER
+        content = encoder.encode(data).encode('utf-8')
+    write_output_file(output_path, content)
+
+
 def validate_config(config: Dict[str, Any]) -> None:
     """Validate that the configuration contains all required fields."""
-    required_fields = [
-        'publisher',
-        'displayName',
-        'iconBrandColor',
-        'supportEmail',
-        'prerequisites',
-        'knownLimitations',
-        'version'
-    ]
-    
-    missing_fields = [field for field in required_fields if field not in config or not config[field]]
+    missing_fields = [field for field in _REQUIRED_FIELDS if not config.get(field)]
     
     if missing_fields:
         print(f"ERROR: Missing required fields in connector-config.yaml: {', '.join(missing_fields)}", file=sys.stderr)
@@ -52,44 +156,46 @@ def validate_config(config: Dict[str, Any]) -> None:
     # Validate connection parameters if present
     if 'connectionParameters' in config:
         for param_name, param_config in config['connectionParameters'].items():
-            if 'type' not in param_config:
-                print(f"ERROR: Connection parameter '{param_name}' missing 'type'", file=sys.stderr)
-                sys.exit(1)
-            if 'uiDefinition' not in param_config:
-                print(f"ERROR: Connection parameter '{param_name}' missing 'uiDefinition'", file=sys.stderr)
-                sys.exit(1)
+            for field in _CONNECTION_PARAMETER_FIELDS:
+                if field not in param_config:
+                    print(f"ERROR: Connection parameter '{param_name}' missing '{field}'", file=sys.stderr)
+                    sys.exit(1)
     
     # Validate policy templates if present
     if 'policyTemplates' in config:
         for template in config['policyTemplates']:
-            if 'templateId' not in template:
-                print(f"ERROR: Policy template missing 'templateId'", file=sys.stderr)
-                sys.exit(1)
-            if 'parameters' not in template:
-                print(f"ERROR: Policy template missing 'parameters'", file=sys.stderr)
-                sys.exit(1)
+            for field in _POLICY_TEMPLATE_FIELDS:
+                if field not in template:
+                    print(f"ERROR: Policy template missing '{field}'", file=sys.stderr)
+                    sys.exit(1)
 
 
-def generate_api_definition(swagger_spec: Dict[str, Any], config: Dict[str, Any], output_path: str) -> None:
+def generate_api_definition(swagger_spec: Dict[str, Any], config: Dict[str, Any], output_path: str,
+                            compact: bool = False) -> None:
     """
     Generate apiDefinition.swagger.json by converting YAML to JSON.
     
+    The title and version in swagger_spec['info'] are updated in place from the
+    config; the spec is not copied, so callers see the overridden values.
+    
     Args:
         swagger_spec: The parsed Swagger specification
         config: The connector configuration
         output_path: Path where the JSON file should be written
+        compact: Write minified JSON instead of indenting with two spaces
     """
-    # Update the title to match the displayName from config
-    if 'info' in swagger_spec and 'displayName' in config:
-        swagger_spec['info']['title'] = config['displayName']
-    
-    # Override version with config value
-    if 'info' in swagger_spec and 'version' in config:
-        swagger_spec['info']['version'] = config['version']
+    info = swagger_spec.get('info')
+    if info is not None:
+        # Update the title to match the displayName from config
+        if 'displayName' in config and info.get('title') != config['displayName']:
+            info['title'] = config['displayName']
+        
+        # Override version with config value
+        if 'version' in config and info.get('version') != config['version']:
+            info['version'] = config['version']
     
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(swagger_spec, f, indent=2)
+        write_json_file(swagger_spec, output_path, compact=compact)
         print(f"✓ Generated: {output_path}")
     except Exception as e:
         print(f"ERROR: Failed to write apiDefinition.swagger.json: {e}", file=sys.stderr)
@@ -141,8 +247,7 @@ def generate_api_properties(config: Dict[str, Any], output_path: str) -> None:
     }
     
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(api_properties, f, indent=2)
+        write_json_file(api_properties, output_path)
         print(f"✓ Generated: {output_path}")
     except Exception as e:
         print(f"ERROR: Failed to write apiProperties.json: {e}", file=sys.stderr)
@@ -167,7 +272,7 @@ def extract_operations(swagger_spec: Dict[str, Any]) -> Dict[str, list]:
     
     for path, methods in swagger_spec['paths'].items():
         for method, operation in methods.items():
-            if method.lower() not in ['get', 'post', 'put', 'patch', 'delete']:
+            if method.lower() not in _HTTP_METHODS:
                 continue
             
             if not isinstance(operation, dict):
@@ -192,6 +297,15 @@ def extract_operations(swagger_spec: Dict[str, Any]) -> Dict[str, list]:
     return {'triggers': triggers, 'actions': actions}
 
 
+def _operation_block(operation: Dict[str, str]) -> str:
+    """Format a trigger or action as a README heading with optional description."""
+    summary = operation['summary']
+    description = operation.get('description', '')
+    if description:
+        return f"#### {summary}\n{description}"
+    return f"#### {summary}"
+
+
 def generate_readme(config: Dict[str, Any], swagger_spec: Dict[str, Any], output_path: str) -> None:
     """
     Generate README.md following Microsoft's certified connector template.
@@ -212,157 +326,108 @@ def generate_readme(config: Dict[str, Any], swagger_spec: Dict[str, Any], output
         swagger_spec: The parsed Swagger specification
         output_path: Path where the README.md file should be written
     """
-    readme_lines = []
+    # Read each config key once up front
+    display_name = config.get('displayName', 'Fulcrum')
+    connection_parameters = config.get('connectionParameters') or {}
+    getting_started = config.get('gettingStarted')
+    known_limitations = config.get('knownLimitations')
+    faqs = config.get('faqs')
+    deployment_instructions = config.get('deploymentInstructions')
+    
+    # Each entry is one Markdown block; blocks are separated by a blank line
+    sections = []
     
     # Title (Required) - One paragraph, two to three sentences about the service and connector
-    display_name = config.get('displayName', 'Fulcrum')
-    readme_lines.append(f"# {display_name}")
-    readme_lines.append("")
+    sections.append(f"# {display_name}")
     # Get description from swaggerCleaner.info.description in connector-config.yaml
     description = config.get('swaggerCleaner', {}).get('info', {}).get('description', '').strip()
     if description:
-        readme_lines.append(description)
-        readme_lines.append("")
+        sections.append(description)
     else:
         # Provide a default description if none is configured
-        readme_lines.append(f"The {display_name} connector enables integration with the {display_name} platform for Power Automate and Power Apps.")
-        readme_lines.append("")
+        sections.append(f"The {display_name} connector enables integration with the {display_name} platform for Power Automate and Power Apps.")
     
     # Publisher (Required) - Company or organization name
-    readme_lines.append("## Publisher")
-    readme_lines.append("")
-    readme_lines.append(config['publisher'])
-    readme_lines.append("")
+    sections.append("## Publisher")
+    sections.append(config['publisher'])
     
     # Prerequisites (Required) - Any plans or licenses, tools required
-    readme_lines.append("## Prerequisites")
-    readme_lines.append("")
-    for prereq in config['prerequisites']:
-        readme_lines.append(f"- {prereq}")
-    readme_lines.append("")
+    sections.append("## Prerequisites")
+    sections.append('\n'.join(f"- {prereq}" for prereq in config['prerequisites']))
     
     # Supported Operations (Required) - Describe actions, triggers, and other endpoints
     operations = extract_operations(swagger_spec)
-    readme_lines.append("## Supported Operations")
-    readme_lines.append("")
+    sections.append("## Supported Operations")
     
     # Triggers
     if operations['triggers']:
-        readme_lines.append("### Triggers")
-        readme_lines.append("")
+        sections.append("### Triggers")
         for trigger in operations['triggers']:
-            summary = trigger['summary']
-            description = trigger.get('description', '')
-            readme_lines.append(f"#### {summary}")
-            if description:
-                readme_lines.append(description)
-            readme_lines.append("")
+            sections.append(_operation_block(trigger))
     
     # Actions
     if operations['actions']:
-        readme_lines.append("### Actions")
-        readme_lines.append("")
+        sections.append("### Actions")
         for action in operations['actions']:
-            summary = action['summary']
-            description = action.get('description', '')
-            readme_lines.append(f"#### {summary}")
-            if description:
-                readme_lines.append(description)
-            readme_lines.append("")
+            sections.append(_operation_block(action))
     
     # Obtaining Credentials (Required) - Explain authentication method and how to get credentials
-    readme_lines.append("## Obtaining Credentials")
-    readme_lines.append("")
+    sections.append("## Obtaining Credentials")
     if 'authentication' in config:
         auth = config['authentication']
-        readme_lines.append(auth.get('description', ''))
-        readme_lines.append("")
+        sections.append(auth.get('description', ''))
         if 'tooltip' in auth:
-            readme_lines.append(auth['tooltip'])
-            readme_lines.append("")
+            sections.append(auth['tooltip'])
     elif 'obtainingCredentials' in config:
-        readme_lines.append(config['obtainingCredentials'].strip())
-        readme_lines.append("")
+        sections.append(config['obtainingCredentials'].strip())
     else:
         # Provide default instructions based on connection parameters
-        if 'connectionParameters' in config and 'api_key' in config['connectionParameters']:
-            api_key_config = config['connectionParameters']['api_key']
+        if 'api_key' in connection_parameters:
+            api_key_config = connection_parameters['api_key']
             tooltip = api_key_config.get('uiDefinition', {}).get('tooltip', '')
             if tooltip:
-                readme_lines.append(tooltip)
+                sections.append(tooltip)
             else:
-                readme_lines.append("You will need an API token to authenticate with this connector.")
+                sections.append("You will need an API token to authenticate with this connector.")
         else:
-            readme_lines.append("Contact the service provider to obtain the necessary credentials.")
-        readme_lines.append("")
+            sections.append("Contact the service provider to obtain the necessary credentials.")
     
     # Getting Started (Optional) - How to get started with the connector
-    if 'gettingStarted' in config and config['gettingStarted']:
-        readme_lines.append("## Getting Started")
-        readme_lines.append("")
-        readme_lines.append(config['gettingStarted'].strip())
-        readme_lines.append("")
+    if getting_started:
+        sections.append("## Getting Started")
+        sections.append(getting_started.strip())
         
         # Add custom host URL documentation if hostUrl connection parameter exists
-        if 'connectionParameters' in config and 'hostUrl' in config['connectionParameters']:
-            readme_lines.append("### Custom Host URLs")
-            readme_lines.append("")
-            readme_lines.append("By default, the connector uses the production Fulcrum API at `api.fulcrumapp.com`. "
-                              "For other regions, you can specify a different host URL "
-                              "when creating your connection.")
-            readme_lines.append("")
-            readme_lines.append("**Regional Endpoints:**")
-            readme_lines.append("- United States (default): `api.fulcrumapp.com`")
-            readme_lines.append("- Canada: `api.fulcrumapp-ca.com`")
-            readme_lines.append("- Australia: `api.fulcrumapp-au.com`")
-            readme_lines.append("- Europe: `api.fulcrumapp-eu.com`")
-            readme_lines.append("")
-            readme_lines.append("**Format:** Enter only the hostname without protocol or path. The connector will "
-                              "automatically use HTTPS and the correct API path.")
-            readme_lines.append("")
-            readme_lines.append("**Troubleshooting:**")
-            readme_lines.append("- Ensure your custom host is accessible from your network")
-            readme_lines.append("- Verify the hostname is correct (no typos)")
-            readme_lines.append("- Confirm your API token is valid for the specified host")
-            readme_lines.append("")
+        if 'hostUrl' in connection_parameters:
+            sections.extend(_CUSTOM_HOST_URLS_SECTIONS)
     
     # Known Issues and Limitations (Required) - Known issues and limitations
-    readme_lines.append("## Known Issues and Limitations")
-    readme_lines.append("")
-    if config.get('knownLimitations'):
-        for limitation in config['knownLimitations']:
-            readme_lines.append(f"- {limitation}")
+    sections.append("## Known Issues and Limitations")
+    if known_limitations:
+        sections.append('\n'.join(f"- {limitation}" for limitation in known_limitations))
     else:
-        readme_lines.append("No known issues or limitations at this time.")
-    readme_lines.append("")
+        sections.append("No known issues or limitations at this time.")
     
     # Frequently Asked Questions (Optional) - FAQs with questions and answers
-    if 'faqs' in config and config['faqs']:
-        readme_lines.append("## Frequently Asked Questions")
-        readme_lines.append("")
-        for faq in config['faqs']:
+    if faqs:
+        sections.append("## Frequently Asked Questions")
+        for faq in faqs:
             question = faq.get('question', '')
             answer = faq.get('answer', '')
             if question:
-                readme_lines.append(f"### {question}")
-                if answer:
-                    readme_lines.append(answer)
-                readme_lines.append("")
+                sections.append(f"### {question}\n{answer}" if answer else f"### {question}")
     
     # Deployment Instructions (Required) - How to deploy as custom connector
-    readme_lines.append("## Deployment Instructions")
-    readme_lines.append("")
-    if 'deploymentInstructions' in config and config['deploymentInstructions']:
-        readme_lines.append(config['deploymentInstructions'].strip())
+    sections.append("## Deployment Instructions")
+    if deployment_instructions:
+        sections.append(deployment_instructions.strip())
     else:
         # Provide default deployment instructions per Microsoft's recommended format
-        readme_lines.append("Please use [these instructions](https://learn.microsoft.com/en-us/connectors/custom-connectors/paconn-cli) to deploy this connector as a custom connector in Microsoft Power Automate and Power Apps.")
-    readme_lines.append("")
+        sections.append("Please use [these instructions](https://learn.microsoft.com/en-us/connectors/custom-connectors/paconn-cli) to deploy this connector as a custom connector in Microsoft Power Automate and Power Apps.")
     
     # Write the file
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(readme_lines))
+        write_output_file(output_path, ('\n\n'.join(sections) + '\n').encode('utf-8'))
         print(f"✓ Generated: {output_path}")
     except Exception as e:
         print(f"ERROR: Failed to write README.md: {e}", file=sys.stderr)
@@ -371,16 +436,21 @@ def generate_readme(config: Dict[str, Any], swagger_spec: Dict[str, Any], output
 
 def main():
     """Main entry point for the certification packager."""
-    if len(sys.argv) != 4:
-        print("Usage: python certification_packager.py <swagger_yaml_path> <config_yaml_path> <output_dir>")
+    args = [arg for arg in sys.argv[1:] if arg != '--compact']
+    compact = len(args) != len(sys.argv) - 1
+    
+    if len(args) != 3:
+        print("Usage: python certification_packager.py [--compact] <swagger_yaml_path> <config_yaml_path> <output_dir>")
+        print("\nOptions:")
+        print("  --compact    Write apiDefinition.swagger.json without indentation")
         print("\nExample:")
         print("  python certification_packager.py build/fulcrum-power-automate-connector.yaml \\")
         print("         connector-config.yaml build/certified-connectors/Fulcrum")
         sys.exit(1)
     
-    swagger_yaml_path = sys.argv[1]
-    config_yaml_path = sys.argv[2]
-    output_dir = sys.argv[3]
+    swagger_yaml_path = args[0]
+    config_yaml_path = args[1]
+    output_dir = args[2]
     
     # Load configuration
     print(f"Loading configuration from {config_yaml_path}...")
@@ -389,18 +459,14 @@ def main():
     
     # Load Swagger specification
     print(f"Loading Swagger specification from {swagger_yaml_path}...")
-    swagger_spec = load_yaml_file(swagger_yaml_path)
+    swagger_spec = load_swagger_file(swagger_yaml_path)
     
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
-    print(f"Output directory: {output_dir}")
-    print("")
-    
-    # Generate the three required files
-    print("Generating certification package files...")
+    print(f"Output directory: {output_dir}\n\nGenerating certification package files...")
     
     api_definition_path = os.path.join(output_dir, "apiDefinition.swagger.json")
-    generate_api_definition(swagger_spec, config, api_definition_path)
+    generate_api_definition(swagger_spec, config, api_definition_path, compact=compact)
     
     api_properties_path = os.path.join(output_dir, "apiProperties.json")
     generate_api_properties(config, api_properties_path)
@@ -408,15 +474,25 @@ def main():
     readme_path = os.path.join(output_dir, "README.md")
     generate_readme(config, swagger_spec, readme_path)
     
-    print("")
-    print("================================================")
-    print("✓ Certification package generated successfully!")
-    print("")
-    print(f"Location: {output_dir}")
-    print("  - apiDefinition.swagger.json")
-    print("  - apiProperties.json")
-    print("  - README.md")
-    print("================================================")
+    # One directory fsync commits all three renames. The files are already in
+    # place, so skip it where directories can't be opened or fsynced (e.g. Windows)
+    try:
+        fsync_directory(output_dir)
+    except OSError:
+        pass
+    
+    # Emit the summary banner with a single write
+    sys.stdout.write(
+        "\n"
+        "================================================\n"
+        "✓ Certification package generated successfully!\n"
+        "\n"
+        f"Location: {output_dir}\n"
+        "  - apiDefinition.swagger.json\n"
+        "  - apiProperties.json\n"
+        "  - README.md\n"
+        "================================================\n"
+    )
 
 
 if __name__ == "__main__":
@@ -3,11 +3,51 @@ import yaml
 import sys
 import os
 import re
-from typing import Dict, Any, Union, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Union, List, Optional, FrozenSet, Set
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Global configuration loaded from connector-config.yaml
 CONFIG = None
 
+# Path item keys that are HTTP operations (as opposed to e.g. parameters)
+HTTP_METHODS = frozenset(("get", "post", "put", "delete", "patch", "options", "head"))
+
+# Node types the tree walkers descend into; everything else is a scalar leaf
+CONTAINER_TYPES = (dict, list)
+
+# Leading path segments treated as API version prefixes (like v1, v2, api, etc.)
+VERSION_PATTERN = re.compile(r"^(v\d+|api|version\d+)$", re.IGNORECASE)
+
+# Parameters shown under advanced options in Power Automate (matched case-insensitively)
+ADVANCED_PARAMETERS = frozenset(("x-skipworkflows", "x-skipwebhooks"))
+
+# Title cleanup patterns used by fix_info_section
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TRAILING_NON_ALNUM_PATTERN = re.compile(r"[^a-zA-Z0-9]+$")
+
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with them
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class NoAliasDumper(YAML_DUMPER):
+    """
+    YAML dumper that writes shared objects out in full.
+
+    The cleaning passes mutate the spec in place, so nodes that were YAML
+    aliases in the input stay shared; emitting them as &id/* anchors would
+    make the output harder to read and diff.
+    """
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
+
+
 def load_config(config_path: str = None) -> Dict[str, Any]:
     """
     Load configuration from connector-config.yaml.
@@ -31,7 +71,7 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YAML_LOADER)
     
     # Validate required swagger cleaner configuration
     if "swaggerCleaner" not in config:
@@ -40,61 +80,85 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     return config
 
 
-def get_endpoints_to_keep() -> List[str]:
-    """Get the list of endpoints to keep from configuration."""
+def get_cleaner_config() -> Dict[str, Any]:
+    """Get the swaggerCleaner section of the configuration, loading it on first use."""
     global CONFIG
     if CONFIG is None:
         CONFIG = load_config()
-    return CONFIG.get("swaggerCleaner", {}).get("endpointsToKeep", [])
+    return CONFIG.get("swaggerCleaner", {})
+
+
+def get_endpoints_to_keep() -> FrozenSet[str]:
+    """Get the set of endpoints to keep from configuration."""
+    return frozenset(get_cleaner_config().get("endpointsToKeep", []))
 
 
 def get_parameters_to_remove() -> List[Dict[str, str]]:
     """Get the list of parameters to remove from configuration."""
-    global CONFIG
-    if CONFIG is None:
-        CONFIG = load_config()
-    return CONFIG.get("swaggerCleaner", {}).get("parametersToRemove", [])
+    return get_cleaner_config().get("parametersToRemove", [])
 
 
 def get_info_config() -> Dict[str, Any]:
     """Get the info section configuration."""
-    global CONFIG
-    if CONFIG is None:
-        CONFIG = load_config()
-    return CONFIG.get("swaggerCleaner", {}).get("info", {})
+    return get_cleaner_config().get("info", {})
 
 
 def get_connector_metadata() -> List[Dict[str, str]]:
     """Get the x-ms-connector-metadata configuration."""
-    global CONFIG
-    if CONFIG is None:
-        CONFIG = load_config()
-    return CONFIG.get("swaggerCleaner", {}).get("connectorMetadata", [])
+    return get_cleaner_config().get("connectorMetadata", [])
 
 
 
-def remove_anyof_oneof(obj: Any) -> Any:
+def remove_anyof_oneof(obj: Any) -> None:
     """
-    Recursively remove anyOf and oneOf properties from a dictionary.
+    Remove anyOf and oneOf properties from every nested object in place.
     Preserves x-ms-* extensions for Power Automate compatibility.
     """
-    if isinstance(obj, dict):
-        # Create a new dict without anyOf and oneOf, but preserve x-ms-* extensions
-        result = {k: v for k, v in obj.items() if k not in ["anyOf", "oneOf"]}
+    # Walk with an explicit stack so deeply nested schemas can't hit the recursion limit
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            node.pop("anyOf", None)
+            node.pop("oneOf", None)
+            stack.extend(value for value in node.values() if type(value) in CONTAINER_TYPES)
+        elif type(node) is list:
+            stack.extend(item for item in node if type(item) in CONTAINER_TYPES)
+
+
+def clean_schema_tree(obj: Any) -> None:
+    """
+    Clean every node of the specification in a single in-place traversal:
+    1. Remove all properties other than x-* extensions from objects that have $ref
+       (when $ref is defined, no other properties should be specified per OpenAPI spec)
+    2. Remove anyOf and oneOf properties (not supported by Power Automate)
 
-        # Process remaining items recursively
-        for key, value in result.items():
-            result[key] = remove_anyof_oneof(value)
+    Extension values kept next to a $ref are only stripped of anyOf/oneOf.
 
-        return result
-    elif isinstance(obj, list):
-        # Process list items recursively
-        return [remove_anyof_oneof(item) for item in obj]
-    else:
-        # Return primitive values as-is
-        return obj
+    Args:
+        obj: The object to process
+    """
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            if "$ref" in node:
+                # Keep only $ref and x-* extension properties
+                for key in [k for k in node if k != "$ref" and not k.startswith("x-")]:
+                    del node[key]
+                for value in node.values():
+                    if type(value) in CONTAINER_TYPES:
+                        remove_anyof_oneof(value)
+                continue
 
+            node.pop("anyOf", None)
+            node.pop("oneOf", None)
+            stack.extend(value for value in node.values() if type(value) in CONTAINER_TYPES)
+        elif type(node) is list:
+            stack.extend(item for item in node if type(item) in CONTAINER_TYPES)
 
+
+@lru_cache(maxsize=1024)
 def get_endpoint_name(path: str) -> str:
     """
     Extract the endpoint name from a path, skipping API version prefixes.
@@ -117,22 +181,34 @@ def get_endpoint_name(path: str) -> str:
     if not parts:
         return "Root"
 
-    # Check if the first part is a version identifier (like v1, v2, api, etc.)
-    version_pattern = re.compile(r"^(v\d+|api|version\d+)$", re.IGNORECASE)
-
     # If first segment is a version, take the second segment as the endpoint name
-    if parts and version_pattern.match(parts[0]):
+    if VERSION_PATTERN.match(parts[0]):
         if len(parts) > 1:
             # Return the second segment (after the version)
-            return parts[1].split(".")[0]  # Remove file extensions like .json
+            return parts[1].split(".", 1)[0]  # Remove file extensions like .json
         else:
             return "API"  # Just the version with no endpoint
     else:
         # No version prefix, use the first segment
-        return parts[0].split(".")[0]  # Remove file extensions like .json
+        return parts[0].split(".", 1)[0]  # Remove file extensions like .json
+
+
+@lru_cache(maxsize=512)
+def get_readable_name(name: str) -> str:
+    """
+    Convert a snake_case or kebab-case parameter name to Title Case.
+
+    Args:
+        name: The parameter name (e.g., 'record_id')
+
+    Returns:
+        The readable name (e.g., 'Record Id')
+    """
+    readable_name = name.replace("_", " ").replace("-", " ")
+    return " ".join(word.capitalize() for word in readable_name.split())
 
 
-def enhance_endpoints(data: Dict[str, Any]) -> Dict[str, Any]:
+def enhance_endpoints(data: Dict[str, Any]) -> None:
     """
     Enhance endpoints by:
     1. Adding a description that is the same as the endpoint name
@@ -141,29 +217,16 @@ def enhance_endpoints(data: Dict[str, Any]) -> Dict[str, Any]:
     4. Ensuring descriptions exist on parameters where required
 
     Args:
-        data: The parsed Swagger/OpenAPI specification
-
-    Returns:
-        Enhanced Swagger/OpenAPI specification
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
-
     # Handle OpenAPI spec
-    if "paths" in result:
-        for path, methods in result["paths"].items():
+    if "paths" in data:
+        for path, methods in data["paths"].items():
             endpoint_name = get_endpoint_name(path)
 
             for method, endpoint_data in methods.items():
                 # Skip non-method properties
-                if method.lower() not in [
-                    "get",
-                    "post",
-                    "put",
-                    "delete",
-                    "patch",
-                    "options",
-                    "head",
-                ]:
+                if method.lower() not in HTTP_METHODS:
                     continue
 
                 # Create description with capitalized endpoint name and method
@@ -189,88 +252,78 @@ def enhance_endpoints(data: Dict[str, Any]) -> Dict[str, Any]:
                 # Add x-ms-summary and descriptions to parameters
                 if "parameters" in endpoint_data:
                     for param in endpoint_data["parameters"]:
+                        param_name = param.get("name", "Parameter")
+
                         # Add x-ms-summary if not present
                         if "x-ms-summary" not in param:
                             # Use the parameter name as the summary, but make it more readable
-                            param_name = param.get("name", "Parameter")
-                            # Convert snake_case or camelCase to Title Case
-                            readable_name = param_name.replace("_", " ").replace("-", " ")
-                            readable_name = " ".join(word.capitalize() for word in readable_name.split())
-                            param["x-ms-summary"] = readable_name
+                            param["x-ms-summary"] = get_readable_name(param_name)
                         
                         # Ensure description exists if not present
                         if "description" not in param:
-                            param["description"] = param.get("x-ms-summary", param.get("name", "Parameter"))
+                            param["description"] = param["x-ms-summary"]
                         
                         # Add x-ms-url-encoding for path parameters
                         if param.get("in") == "path" and "x-ms-url-encoding" not in param:
                             param["x-ms-url-encoding"] = "single"
                         
                         # Set x-ms-visibility to advanced for x-skipworkflows and x-skipwebhooks parameters
-                        param_name = param.get("name", "")
-                        if param_name.lower() in ["x-skipworkflows", "x-skipwebhooks"]:
+                        if param_name.lower() in ADVANCED_PARAMETERS:
                             param["x-ms-visibility"] = "advanced"
 
-    return result
-
 
-def filter_endpoints(data: Dict[str, Any]) -> Dict[str, Any]:
+def filter_endpoints(data: Dict[str, Any]) -> Set[str]:
     """
     Filter the Swagger/OpenAPI specification to keep only specified endpoints.
 
     Args:
-        data: The parsed Swagger/OpenAPI specification
+        data: The parsed Swagger/OpenAPI specification (modified in place)
 
     Returns:
-        Filtered Swagger/OpenAPI specification
+        Set of configured endpoint keys that were found and kept
     """
     endpoints_to_keep = get_endpoints_to_keep()
+    kept_endpoints = set()
     
-    # If no endpoints specified, return the full data
+    # If no endpoints specified, keep the full spec
     if not endpoints_to_keep:
-        return data
-
-    result = data.copy()
+        return kept_endpoints
 
     # Handle OpenAPI spec
-    if "paths" in result:
-        filtered_paths = {}
+    if "paths" in data:
+        paths = data["paths"]
 
-        for path, methods in result["paths"].items():
-            filtered_methods = {}
+        for path, methods in list(paths.items()):
+            path_prefix = path + "/"
 
+            # Build a new path item rather than deleting from the existing one:
+            # YAML aliases can make several paths share the same path item dict
+            filtered_methods = {}
             for method, endpoint_data in methods.items():
-                endpoint_key = f"{path}/{method}"
                 method_lower = method.lower()
-                endpoint_key_lower = f"{path}/{method_lower}"
-
-                # Check if this is a HTTP method or a property like parameters
-                if method.lower() in [
-                    "get",
-                    "post",
-                    "put",
-                    "delete",
-                    "patch",
-                    "options",
-                    "head",
-                ]:
-                    # Check if the endpoint should be kept
-                    if (
-                        endpoint_key in endpoints_to_keep
-                        or endpoint_key_lower in endpoints_to_keep
-                    ):
-                        filtered_methods[method] = endpoint_data
-                else:
-                    # Keep non-HTTP method properties (like parameters)
-                    filtered_methods[method] = endpoint_data
-
-            # Only include the path if it has methods
-            if filtered_methods:
-                filtered_paths[path] = filtered_methods
 
-        result["paths"] = filtered_paths
+                # Only HTTP methods are filtered; properties like parameters are kept
+                if method_lower in HTTP_METHODS:
+                    endpoint_key = path_prefix + method
+
+                    # Drop the endpoint unless it should be kept; the lower-case
+                    # key only differs when the spec uses upper-case methods
+                    if endpoint_key in endpoints_to_keep:
+                        kept_endpoints.add(endpoint_key)
+                    elif method != method_lower and path_prefix + method_lower in endpoints_to_keep:
+                        kept_endpoints.add(path_prefix + method_lower)
+                    else:
+                        continue
 
-    return result
+                filtered_methods[method] = endpoint_data
+
+            # Only keep the path if it still has methods
+            if filtered_methods:
+                paths[path] = filtered_methods
+            else:
+                del paths[path]
+
+    return kept_endpoints
 
 
 def find_used_models(data: Dict[str, Any]) -> set:
@@ -284,145 +337,94 @@ def find_used_models(data: Dict[str, Any]) -> set:
         Set of model names that are used
     """
     used_models = set()
+    prefix = "#/definitions/"
+    prefix_len = len(prefix)
+
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if type(obj) is dict:
+            ref = obj.get("$ref")
+            # Extract model name from reference like "#/definitions/ModelName"
+            if ref is not None and ref.startswith(prefix):
+                used_models.add(ref[prefix_len:])
+            stack.extend(obj.values())
+        elif type(obj) is list:
+            stack.extend(obj)
 
-    def extract_refs(obj: Any) -> None:
-        """Recursively extract all $ref values."""
-        if isinstance(obj, dict):
-            if "$ref" in obj:
-                ref = obj["$ref"]
-                # Extract model name from reference like "#/definitions/ModelName"
-                if ref.startswith("#/definitions/"):
-                    model_name = ref.replace("#/definitions/", "")
-                    used_models.add(model_name)
-            for value in obj.values():
-                extract_refs(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                extract_refs(item)
-
-    extract_refs(data)
     return used_models
 
 
-def remove_unused_models(data: Dict[str, Any]) -> Dict[str, Any]:
+def remove_unused_models(data: Dict[str, Any]) -> None:
     """
     Remove unused model definitions from the specification.
 
     Args:
-        data: The parsed Swagger/OpenAPI specification
-
-    Returns:
-        Specification with unused models removed
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
-
-    if "definitions" not in result:
-        return result
-
-    # Find all models that are actually used
-    used_models = find_used_models(data)
-
-    # Keep track of which models were removed
-    removed_models = []
-
-    # Filter definitions to only include used models
-    filtered_definitions = {}
-    for model_name, model_def in result["definitions"].items():
-        if model_name in used_models:
-            filtered_definitions[model_name] = model_def
-        else:
-            removed_models.append(model_name)
-
-    result["definitions"] = filtered_definitions
+    if "definitions" not in data:
+        return
+
+    definitions = data["definitions"]
+
+    # Seed with models referenced outside of definitions, then follow references
+    # from used models only, so chains hanging off unused models are dropped too
+    used_models = find_used_models({key: value for key, value in data.items() if key != "definitions"})
+    pending = list(used_models)
+    while pending:
+        for model_name in find_used_models(definitions.get(pending.pop())):
+            if model_name not in used_models:
+                used_models.add(model_name)
+                pending.append(model_name)
+
+    # Drop definitions that are not used, keeping track of which were removed
+    removed_models = [model_name for model_name in definitions if model_name not in used_models]
+    for model_name in removed_models:
+        del definitions[model_name]
 
     if removed_models:
         print(f"Removed {len(removed_models)} unused model(s): {', '.join(sorted(removed_models))}")
 
-    return result
-
-
-def remove_description_from_refs(obj: Any) -> Any:
-    """
-    Recursively remove description properties from objects that have $ref.
-    When $ref is defined, no other properties should be specified per OpenAPI spec.
-    
-    Args:
-        obj: The object to process
-        
-    Returns:
-        Processed object with descriptions removed from $ref objects
-    """
-    if isinstance(obj, dict):
-        # If this object has a $ref, remove description and other non-extension properties
-        if "$ref" in obj:
-            # Keep only $ref and x-* extension properties
-            result = {"$ref": obj["$ref"]}
-            for key, value in obj.items():
-                if key.startswith("x-"):
-                    result[key] = value
-            return result
-        else:
-            # Process all values recursively
-            return {k: remove_description_from_refs(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [remove_description_from_refs(item) for item in obj]
-    else:
-        return obj
-
 
-def keep_only_success_responses(data: Dict[str, Any]) -> Dict[str, Any]:
+def keep_only_success_responses(data: Dict[str, Any]) -> None:
     """
     Keep only success responses (200, 201, 204) and remove error responses (400, 401, 404, 422, etc.)
     This addresses the Power Automate warning about multiple response schemas.
     
     Args:
-        data: The parsed Swagger/OpenAPI specification
-        
-    Returns:
-        Specification with only success responses
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
-    
-    if "paths" not in result:
-        return result
+    if "paths" not in data:
+        return
         
-    for path, methods in result["paths"].items():
+    for path, methods in data["paths"].items():
         for method, endpoint_data in methods.items():
             # Skip non-method properties
-            if method.lower() not in ["get", "post", "put", "delete", "patch", "options", "head"]:
+            if method.lower() not in HTTP_METHODS:
                 continue
                 
-            if "responses" in endpoint_data:
-                # Keep only success responses (2xx)
-                filtered_responses = {}
-                for status_code, response in endpoint_data["responses"].items():
-                    if status_code.startswith("2"):  # 200, 201, 204, etc.
-                        filtered_responses[status_code] = response
-                        
-                endpoint_data["responses"] = filtered_responses
-                
-    return result
+            responses = endpoint_data.get("responses")
+            if responses:
+                # Keep only success responses (2xx: 200, 201, 204, 2XX, etc.); this also
+                # drops "default". Unquoted YAML status codes load as ints, hence str()
+                for status_code in [code for code in responses if str(code)[:1] != "2"]:
+                    del responses[status_code]
 
 
-def make_webhook_url_required(data: Dict[str, Any]) -> Dict[str, Any]:
+def make_webhook_url_required(data: Dict[str, Any]) -> None:
     """
     Make the webhook URL property required in the WebhookRequest schema.
     This addresses the Power Automate warning about notification URL not being required.
     
     Args:
-        data: The parsed Swagger/OpenAPI specification
-        
-    Returns:
-        Specification with webhook URL marked as required
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
-    
-    if "definitions" not in result:
-        return result
+    if "definitions" not in data:
+        return
         
     # Find WebhookRequest definition
-    if "WebhookRequest" in result["definitions"]:
-        webhook_def = result["definitions"]["WebhookRequest"]
+    if "WebhookRequest" in data["definitions"]:
+        webhook_def = data["definitions"]["WebhookRequest"]
         if "properties" in webhook_def and "webhook" in webhook_def["properties"]:
             webhook_prop = webhook_def["properties"]["webhook"]
             if "properties" in webhook_prop and "url" in webhook_prop["properties"]:
@@ -435,32 +437,25 @@ def make_webhook_url_required(data: Dict[str, Any]) -> Dict[str, Any]:
             # Remove unsupported minProperties keyword
             if "minProperties" in webhook_prop:
                 del webhook_prop["minProperties"]
-                
-    return result
 
 
-def remove_empty_success_response_schemas(data: Dict[str, Any]) -> Dict[str, Any]:
+def remove_empty_success_response_schemas(data: Dict[str, Any]) -> None:
     """
     Remove schema definitions from responses that reference EmptySuccessResponse.
     Empty success responses should not define a schema at all.
     
     Args:
-        data: The parsed Swagger/OpenAPI specification
-        
-    Returns:
-        Specification with EmptySuccessResponse schemas removed
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
-    
-    if "paths" not in result:
-        return result
+    if "paths" not in data:
+        return
     
     removed_count = 0
     
-    for path, methods in result["paths"].items():
+    for path, methods in data["paths"].items():
         for method, endpoint_data in methods.items():
             # Skip non-method properties
-            if method.lower() not in ["get", "post", "put", "delete", "patch", "options", "head"]:
+            if method.lower() not in HTTP_METHODS:
                 continue
                 
             if "responses" in endpoint_data:
@@ -478,37 +473,42 @@ def remove_empty_success_response_schemas(data: Dict[str, Any]) -> Dict[str, Any
                                 
     if removed_count > 0:
         print(f"Removed {removed_count} EmptySuccessResponse schema reference(s)")
-    
-    return result
 
 
-def remove_configured_parameters(data: Dict[str, Any]) -> Dict[str, Any]:
+def remove_configured_parameters(data: Dict[str, Any]) -> None:
     """
     Remove parameters from all endpoints based on configuration.
     Parameters like x-apitoken and accept headers are removed since they're
     handled by Power Automate's connection configuration.
     
     Args:
-        data: The parsed Swagger/OpenAPI specification
-        
-    Returns:
-        Specification with configured parameters removed
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
-    
-    if "paths" not in result:
-        return result
+    if "paths" not in data:
+        return
     
     params_to_remove = get_parameters_to_remove()
     if not params_to_remove:
-        return result
+        return
+
+    # Index the removal rules once: names removed wherever they appear, and
+    # (name, location) pairs removed only from that location
+    names_to_remove = set()
+    located_params_to_remove = set()
+    for removal_config in params_to_remove:
+        config_name = removal_config.get("name", "").lower()
+        config_in = removal_config.get("in", "")
+        if config_in:
+            located_params_to_remove.add((config_name, config_in))
+        else:
+            names_to_remove.add(config_name)
     
     removed_count = 0
     
-    for path, methods in result["paths"].items():
+    for path, methods in data["paths"].items():
         for method, endpoint_data in methods.items():
             # Skip non-method properties
-            if method.lower() not in ["get", "post", "put", "delete", "patch", "options", "head"]:
+            if method.lower() not in HTTP_METHODS:
                 continue
                 
             if "parameters" in endpoint_data:
@@ -517,21 +517,13 @@ def remove_configured_parameters(data: Dict[str, Any]) -> Dict[str, Any]:
                 # Filter out configured parameters
                 filtered_params = []
                 for param in endpoint_data["parameters"]:
-                    should_remove = False
                     param_name = param.get("name", "").lower()
-                    param_in = param.get("in", "")
                     
-                    for removal_config in params_to_remove:
-                        config_name = removal_config.get("name", "").lower()
-                        config_in = removal_config.get("in", "")
-                        
-                        # Check if parameter matches removal criteria
-                        if param_name == config_name and (not config_in or param_in == config_in):
-                            should_remove = True
-                            break
+                    # Check if parameter matches removal criteria
+                    if param_name in names_to_remove or (param_name, param.get("in", "")) in located_params_to_remove:
+                        continue
                     
-                    if not should_remove:
-                        filtered_params.append(param)
+                    filtered_params.append(param)
                 
                 endpoint_data["parameters"] = filtered_params
                 removed_count += (original_count - len(filtered_params))
@@ -542,11 +534,9 @@ def remove_configured_parameters(data: Dict[str, Any]) -> Dict[str, Any]:
     
     if removed_count > 0:
         print(f"Removed {removed_count} configured parameter(s) from endpoints")
-    
-    return result
 
 
-def fix_info_section(data: Dict[str, Any]) -> Dict[str, Any]:
+def fix_info_section(data: Dict[str, Any]) -> None:
     """
     Fix the info section to meet Power Automate certification requirements:
     1. Remove restricted words from title (api, connector)
@@ -556,15 +546,12 @@ def fix_info_section(data: Dict[str, Any]) -> Dict[str, Any]:
     5. Add x-ms-connector-metadata at root level (not in info)
 
     Args:
-        data: The parsed Swagger/OpenAPI specification
-
-    Returns:
-        Specification with fixed info section
+        data: The parsed Swagger/OpenAPI specification (modified in place)
     """
-    result = data.copy()
+    if "info" not in data:
+        return
 
-    if "info" not in result:
-        return result
+    info = data["info"]
 
     info_config = get_info_config()
     restricted_words = info_config.get("titleRestrictedWords", ["api", "connector"])
@@ -572,37 +559,62 @@ def fix_info_section(data: Dict[str, Any]) -> Dict[str, Any]:
     default_description = info_config.get("description", "")
 
     # Fix title - remove restricted words
-    if "title" in result["info"]:
-        title = result["info"]["title"]
-        # Remove restricted words (case insensitive)
-        for word in restricted_words:
-            title = re.sub(rf'\b{word}\b', '', title, flags=re.IGNORECASE)
+    if "title" in info:
+        title = info["title"]
+        # Remove restricted words (case insensitive) in a single pass
+        if restricted_words:
+            restricted_pattern = re.compile(
+                rf"\b(?:{'|'.join(map(re.escape, restricted_words))})\b", re.IGNORECASE
+            )
+            title = restricted_pattern.sub('', title)
         # Clean up extra spaces
-        title = re.sub(r'\s+', ' ', title).strip()
+        title = WHITESPACE_PATTERN.sub(' ', title).strip()
         # Ensure title ends with alphanumeric character
-        title = re.sub(r'[^a-zA-Z0-9]+$', '', title)
-        result["info"]["title"] = title
+        title = TRAILING_NON_ALNUM_PATTERN.sub('', title)
+        info["title"] = title
 
     # Add description if missing (must be 30-500 characters)
-    if "description" not in result["info"] or not result["info"]["description"] or len(result["info"]["description"]) < 30:
+    if "description" not in info or not info["description"] or len(info["description"]) < 30:
         if default_description:
-            result["info"]["description"] = default_description
+            info["description"] = default_description
 
     # Add contact if missing
-    if "contact" not in result["info"] and contact_config:
-        result["info"]["contact"] = contact_config
+    if "contact" not in info and contact_config:
+        info["contact"] = contact_config
 
     # Remove x-ms-connector-metadata from info if present (it should be at root level)
-    if "x-ms-connector-metadata" in result["info"]:
-        del result["info"]["x-ms-connector-metadata"]
+    if "x-ms-connector-metadata" in info:
+        del info["x-ms-connector-metadata"]
 
     # Add x-ms-connector-metadata at root level if missing
-    if "x-ms-connector-metadata" not in result:
+    if "x-ms-connector-metadata" not in data:
         connector_metadata = get_connector_metadata()
         if connector_metadata:
-            result["x-ms-connector-metadata"] = connector_metadata
+            data["x-ms-connector-metadata"] = connector_metadata
+
+
+def load_spec(input_file: str) -> Dict[str, Any]:
+    """
+    Parse a Swagger/OpenAPI file, choosing YAML or JSON by extension.
 
-    return result
+    Args:
+        input_file: Path to the input Swagger/OpenAPI file
+
+    Returns:
+        Parsed specification dictionary
+    """
+    _, ext = os.path.splitext(input_file.lower())
+
+    # Read the raw bytes once and hand the whole buffer to the parser
+    with open(input_file, "rb") as f:
+        content = f.read()
+
+    if ext in [".yaml", ".yml"]:
+        return yaml.load(content, Loader=YAML_LOADER)
+    elif orjson is not None:
+        return orjson.loads(content)
+    else:  # Default to JSON
+        return json.loads(content)
 
 
 def process_file(input_file: str, output_file: str = None) -> None:
@@ -625,73 +637,71 @@ def process_file(input_file: str, output_file: str = None) -> None:
     _, ext = os.path.splitext(input_file.lower())
 
     try:
-        # Read the file
-        with open(input_file, "r", encoding="utf-8") as f:
-            if ext in [".yaml", ".yml"]:
-                data = yaml.safe_load(f)
-            else:  # Default to JSON
-                data = json.load(f)
+        data = load_spec(input_file)
 
         # First filter endpoints
-        filtered_data = filter_endpoints(data)
+        kept_endpoints = filter_endpoints(data)
 
         # Keep only success responses (remove error responses)
         # Do this BEFORE removing unused models so error response models get cleaned up
-        success_only = keep_only_success_responses(filtered_data)
+        keep_only_success_responses(data)
 
         # Fix info section for Power Automate certification
-        fixed_info = fix_info_section(success_only)
+        fix_info_section(data)
 
         # Make webhook URL required and remove unsupported keywords
-        fixed_webhooks = make_webhook_url_required(fixed_info)
+        make_webhook_url_required(data)
 
         # Remove EmptySuccessResponse schemas
-        no_empty_schemas = remove_empty_success_response_schemas(fixed_webhooks)
+        remove_empty_success_response_schemas(data)
 
         # Remove configured parameters (authentication and accept headers handled by Power Automate)
-        no_unwanted_params = remove_configured_parameters(no_empty_schemas)
+        remove_configured_parameters(data)
         
         # Remove unused models AFTER removing EmptySuccessResponse refs and error responses
         # This ensures EmptySuccessResponse and other now-unused models are properly removed
-        cleaned_models = remove_unused_models(no_unwanted_params)
+        remove_unused_models(data)
 
         # Then enhance the endpoints
-        enhanced_data = enhance_endpoints(cleaned_models)
-
-        # Remove descriptions from $ref properties
-        no_ref_descriptions = remove_description_from_refs(enhanced_data)
-
-        # Finally process the data to remove anyOf and oneOf
-        cleaned_data = remove_anyof_oneof(no_ref_descriptions)
-
-        # Write the cleaned data back
-        with open(output_file, "w", encoding="utf-8") as f:
-            if ext in [".yaml", ".yml"]:
-                yaml.dump(cleaned_data, f, default_flow_style=False, sort_keys=False)
-            else:  # Default to JSON
-                json.dump(cleaned_data, f, indent=2)
+        enhance_endpoints(data)
+
+        # Finally strip $ref siblings and anyOf/oneOf in one pass over the tree
+        clean_schema_tree(data)
+
+        # Serialize to bytes in memory, then write the cleaned data back in one call
+        if ext in [".yaml", ".yml"]:
+            output = yaml.dump(
+                data,
+                Dumper=NoAliasDumper,
+                default_flow_style=False,
+                sort_keys=False,
+                allow_unicode=True,
+                width=1000,
+            ).encode("utf-8")
+        elif orjson is not None:
+            output = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:  # Default to JSON
+            output = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        with open(output_file, "wb") as f:
+            f.write(output)
 
         # Print summary of operation
         endpoints_to_keep = get_endpoints_to_keep()
         if endpoints_to_keep:
-            endpoint_count = sum(
-                1
-                for path in cleaned_data.get("paths", {}).values()
-                for method in path.keys()
-                if method.lower()
-                in ["get", "post", "put", "delete", "patch", "options", "head"]
-            )
             print(f"Successfully processed {input_file} -> {output_file}")
             print(
-                f"Filtered to {endpoint_count} endpoints out of {len(endpoints_to_keep)} specified"
+                f"Filtered to {len(kept_endpoints)} endpoints out of {len(endpoints_to_keep)} specified"
             )
             print("Added descriptions and capitalized operationIds")
 
-            # Check if fewer endpoints than specified
-            if endpoint_count < len(endpoints_to_keep):
+            # Report specified endpoints that were not found
+            missing_endpoints = endpoints_to_keep - kept_endpoints
+            if missing_endpoints:
                 print(
-                    "Warning: Some specified endpoints were not found in the input file."
+                    "Warning: Some specified endpoints were not found in the input file:"
                 )
+                for endpoint in sorted(missing_endpoints):
+                    print(f"  {endpoint}")
                 print("Use --list-endpoints to see available endpoints.")
         else:
             print(
@@ -711,38 +721,23 @@ def print_available_endpoints(input_file: str) -> None:
     Args:
         input_file: Path to the input Swagger/OpenAPI file
     """
-    _, ext = os.path.splitext(input_file.lower())
-
     try:
-        # Read the file
-        with open(input_file, "r", encoding="utf-8") as f:
-            if ext in [".yaml", ".yml"]:
-                data = yaml.safe_load(f)
-            else:  # Default to JSON
-                data = json.load(f)
+        data = load_spec(input_file)
 
         print("Available endpoints:")
 
         if "paths" in data:
             endpoints = []
             for path, methods in data["paths"].items():
-                for method, _ in methods.items():
-                    if method.lower() in [
-                        "get",
-                        "post",
-                        "put",
-                        "delete",
-                        "patch",
-                        "options",
-                        "head",
-                    ]:
-                        endpoint = f"{path}/{method.lower()}"
-                        endpoints.append(endpoint)
-
-            # Sort endpoints for easier reading
+                for method in methods:
+                    method_lower = method.lower()
+                    if method_lower in HTTP_METHODS:
+                        endpoints.append(f"{path}/{method_lower}")
+
+            # Sort endpoints for easier reading and print them in one write
             endpoints.sort()
-            for endpoint in endpoints:
-                print(f'  "{endpoint}",')
+            if endpoints:
+                print("\n".join(f'  "{endpoint}",' for endpoint in endpoints))
 
     except Exception as e:
         print(f"Error reading {input_file}: {str(e)}")
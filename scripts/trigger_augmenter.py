@@ -22,6 +22,18 @@ import sys
 import os
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parameter names that carry the webhook callback URL
+CALLBACK_URL_PARAMETERS = frozenset(("url", "callback_url", "webhook_url"))
+
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with them
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def create_webhook_payload_schema() -> Dict[str, Any]:
     """
@@ -113,8 +125,10 @@ def augment_webhook_endpoint(
     # First check direct parameters
     if "parameters" in post_operation:
         for param in post_operation["parameters"]:
+            param_name = param.get("name")
+
             # Look for the URL/callback parameter
-            if param.get("name") in ["url", "callback_url", "webhook_url"]:
+            if param_name in CALLBACK_URL_PARAMETERS:
                 param["x-ms-notification-url"] = True
                 param["x-ms-visibility"] = "internal"
                 param["x-ms-summary"] = "Callback URL"
@@ -127,7 +141,7 @@ def augment_webhook_endpoint(
             
             # Check if this is a body parameter with a schema reference
             # For Fulcrum API, the URL is in the body schema, so we mark the entire body
-            if param.get("in") == "body" and param.get("name") == "body":
+            if param_name == "body" and param.get("in") == "body":
                 # Mark the body parameter as required
                 param["required"] = True
                 # We'll add x-ms-notification-url at the schema level via the definitions
@@ -309,19 +323,23 @@ def process_file(input_file: str, output_file: Optional[str] = None) -> None:
     _, ext = os.path.splitext(input_file.lower())
 
     try:
-        # Read the file
-        with open(input_file, "r", encoding="utf-8") as f:
-            if ext in [".yaml", ".yml"]:
-                data = yaml.safe_load(f)
-            else:  # Default to JSON
-                data = json.load(f)
+        # Read the raw bytes once; both parsers detect the encoding themselves
+        with open(input_file, "rb") as f:
+            content = f.read()
+
+        if ext in [".yaml", ".yml"]:
+            data = yaml.load(content, Loader=YAML_LOADER)
+        elif orjson is not None:
+            data = orjson.loads(content)
+        else:  # Default to JSON
+            data = json.loads(content)
 
         # Augment the spec
         success, messages = augment_spec(data)
 
-        # Print messages
-        for message in messages:
-            print(message)
+        # Print messages in one write
+        if messages:
+            print("\n".join(messages))
 
         if not success:
             sys.exit(1)
@@ -329,11 +347,22 @@ def process_file(input_file: str, output_file: Optional[str] = None) -> None:
         # Write the augmented data
         output_path = output_file if output_file else input_file
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            if ext in [".yaml", ".yml"]:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-            else:  # Default to JSON
-                json.dump(data, f, indent=2)
+        # Serialize to bytes in memory, then write in a single binary call
+        if ext in [".yaml", ".yml"]:
+            output = yaml.dump(
+                data,
+                Dumper=YAML_DUMPER,
+                default_flow_style=False,
+                sort_keys=False,
+                allow_unicode=True,
+                width=1000,
+            ).encode("utf-8")
+        elif orjson is not None:
+            output = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:  # Default to JSON
+            output = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        with open(output_path, "wb") as f:
+            f.write(output)
 
         print(f"\nSuccessfully augmented {input_file}")
         if output_file: